@@ -1,32 +1,226 @@
+import codecs
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
 import os
+import re
 import uuid
+import time
+import threading
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
-import base64
+from typing import Dict, Any, List, Optional, Tuple
+from binascii import b2a_base64
 from urllib.parse import unquote_plus
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder if orjson is not packaged
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Store raw text uncompressed if zstandard is not packaged
+    zstandard = None
+
+# Load the MIME type database during INIT rather than on the first lookup
+mimetypes.init()
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
+logging.getLogger('boto3').setLevel(logging.WARNING)
+logging.getLogger('botocore').setLevel(logging.WARNING)
+
+# Client configuration: keep connections alive between warm invocations and
+# size the pools for concurrent record processing and ranged GETs
+_s3_cfg = Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
+_dynamodb_cfg = Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
+# Bedrock fails fast on connect and bounds retries under throttling so a
+# stalled call cannot burn the whole invocation
+_bedrock_cfg = Config(
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=90,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+)
+_lambda_cfg = Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-bedrock_client = boto3.client('bedrock-runtime')
-bedrock_agent_client = boto3.client('bedrock-agent-runtime')
+s3_client = boto3.client('s3', config=_s3_cfg)
+dynamodb = boto3.resource('dynamodb', config=_dynamodb_cfg)
+bedrock_client = boto3.client('bedrock-runtime', config=_bedrock_cfg)
+bedrock_agent_client = boto3.client('bedrock-agent-runtime', config=_bedrock_cfg)
+lambda_client = boto3.client('lambda', config=_lambda_cfg)
+# Textract uses the same fail-fast settings as Bedrock
+textract_client = boto3.client('textract', config=_bedrock_cfg)
 
 # Environment variables
 DYNAMODB_TABLE_NAME = os.environ['DYNAMODB_TABLE_NAME']
 BEDROCK_MODEL_ID = os.environ['BEDROCK_MODEL_ID']
 S3_BUCKET_NAME = os.environ['S3_BUCKET_NAME']
+ACCOUNT_ID = os.environ.get('ACCOUNT_ID')
+SUMMARIZE_FN = os.environ.get('SUMMARIZE_FN')
+RECORD_CONCURRENCY = int(os.environ.get('RECORD_CONCURRENCY', '8'))
+
+# Ranged GET tuning for large source documents
+S3_PART_SIZE = 8 * 1024 * 1024
+S3_RANGE_WORKERS = 8
+
+# Streaming reads for text files: chunk size and cap on decoded characters
+TEXT_CHUNK_SIZE = 64 * 1024
+MAX_TEXT_LEN = 10_000_000
+
+# BatchWriteItem accepts at most 25 items per call
+DYNAMODB_BATCH_SIZE = 25
+
+# Raw text larger than this (in UTF-8 bytes) is stored in S3 instead of DynamoDB
+RAW_TEXT_INLINE_LIMIT = 32_000
+DERIVED_TEXT_PREFIX = 'derived/'
+# Only the text objects this function writes are skipped, not every upload
+# that happens to share the prefix
+_DERIVED_TEXT_KEY = re.compile(
+    re.escape(DERIVED_TEXT_PREFIX) + r'[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}\.txt(?:\.zst)?'
+)
+
+# zstd level for raw text; compressor contexts are per thread (not thread safe)
+ZSTD_LEVEL = 3
+_zstd_local = threading.local()
+
+# Media types for documents that are sent to the vision model
+_MEDIA_TYPE = {
+    'pdf': 'application/pdf',
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'tiff': 'image/tiff',
+    'gif': 'image/gif',
+    'bmp': 'image/bmp'
+}
+_VISION_EXTS = frozenset(_MEDIA_TYPE)
+
+# Textract handles PDFs and common image formats; Bedrock vision is only used
+# for other formats or when Textract's line confidence is too low
+_TEXTRACT_EXTS = frozenset(['pdf', 'png', 'jpg', 'jpeg', 'tiff'])
+TEXTRACT_MIN_CONFIDENCE = 80.0
+TEXTRACT_SYNC_MAX_BYTES = 10 * 1024 * 1024
+TEXTRACT_POLL_INTERVAL = 1
+
+# Time kept back from the Lambda timeout for writing results after records finish
+INVOCATION_RESERVE_SECONDS = 30
+
+# Token budgets: text extraction, standalone summaries, and the extra room
+# the fused extraction call gets for its summary and JSON escaping
+OCR_MAX_TOKENS = 8000
+SUMMARY_MAX_TOKENS = 1000
+FUSED_SUMMARY_MAX_TOKENS = 1200
+
+# Fixed parts of the Bedrock request bodies; callers copy and fill in messages
+_OCR_REQ_TEMPLATE = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": OCR_MAX_TOKENS,
+    "temperature": 0.1,
+    "top_p": 0.9
+}
+_SUM_REQ_TEMPLATE = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": SUMMARY_MAX_TOKENS,
+    "temperature": 0.3,
+    "top_p": 0.9
+}
+
+# Input cap for standalone summaries (~6k tokens of English text)
+MAX_SUMMARY_CHARS = 24_000
+
+# Converse content block type and format for documents Bedrock can read from S3
+_CONVERSE_FORMAT = {
+    'pdf': ('document', 'pdf'),
+    'png': ('image', 'png'),
+    'jpg': ('image', 'jpeg'),
+    'jpeg': ('image', 'jpeg'),
+    'gif': ('image', 'gif')
+}
+
+# Keys of the {"text": "...", "summary": "..."} object requested from the
+# fused vision call, in whatever order the model writes them
+_FUSED_KEY = re.compile(r'"(text|summary)"\s*:\s*"')
+_json_decoder = json.JSONDecoder()
+
+# Cleared the first time the model rejects S3 document references (Anthropic
+# models do), so the rest of the container's invocations go straight inline
+_converse_s3_supported = True
+
+# A ValidationException about the S3 source itself, rather than the document
+_CONVERSE_S3_REJECTED = re.compile(r"s3.*(?:not|n't) support|(?:not|n't) support.*s3",
+                                   re.IGNORECASE)
 
 # Initialize DynamoDB table
 table = dynamodb.Table(DYNAMODB_TABLE_NAME)
 
+# Thread pool for processing records concurrently (reused across warm invocations)
+EXECUTOR = ThreadPoolExecutor(max_workers=RECORD_CONCURRENCY)
+
+
+def _prime_clients() -> None:
+    """
+    Warm up credentials and connections during the Lambda INIT phase so the
+    first event does not pay for credential resolution and TLS handshakes.
+    Each client is primed independently; failures are logged and never raised.
+    """
+    try:
+        s3_client.head_bucket(Bucket=S3_BUCKET_NAME)
+    except Exception as e:
+        logger.warning("S3 client warmup failed: %s", e)
+
+    try:
+        # A point read of a key that never exists; GetItem is already granted
+        table.meta.client.get_item(
+            TableName=DYNAMODB_TABLE_NAME,
+            Key={'document_id': '__warmup__'},
+            ProjectionExpression='document_id'
+        )
+    except Exception as e:
+        logger.warning("DynamoDB client warmup failed: %s", e)
+
+
+_prime_clients()
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data: Any) -> Any:
+    """Deserialize JSON bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _ext(key: str) -> str:
+    """Return the lower-cased file extension of an S3 key, or '' if none."""
+    i = key.rfind('.')
+    return key[i + 1:].lower() if i >= 0 else ''
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -39,27 +233,71 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict containing processing results
     """
+    # Scheduled warmer pings only keep the container alive
+    if event.get('source') == 'aws.events' and event.get('detail-type') == 'Scheduled Event':
+        return {'statusCode': 200, 'body': 'warm'}
+    
+    if not event.get('Records'):
+        return {'statusCode': 204, 'body': '{}'}
+    
     try:
-        logger.info(f"Processing event: {json.dumps(event, default=str)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing event: %s", json.dumps(event, default=str))
+        
+        # Process S3 records concurrently, preserving event order
+        # Skip derived text objects written back to the bucket by this function
+        records = [
+            r for r in event['Records']
+            if r['eventSource'] == 'aws:s3'
+            and not _DERIVED_TEXT_KEY.fullmatch(unquote_plus(r['s3']['object']['key']))
+        ]
+        skipped = len(event['Records']) - len(records)
+        if skipped:
+            logger.info("Skipping %d non-document records", skipped)
+        logger.info("Processing %d records", len(records))
         
-        # Process each record in the event
-        results = []
-        for record in event['Records']:
-            if record['eventSource'] == 'aws:s3':
-                result = process_s3_record(record)
-                results.append(result)
+        # Long-running steps must finish before the invocation times out
+        deadline = None
+        if context is not None:
+            deadline = (time.monotonic() + context.get_remaining_time_in_millis() / 1000
+                        - INVOCATION_RESERVE_SECONDS)
+        results = list(EXECUTOR.map(partial(process_s3_record, deadline=deadline), records))
         
-        logger.info(f"Processing completed. Results: {results}")
+        # Write all processed documents to DynamoDB in batches
+        items = [result.pop('item') for result in results if 'item' in result]
+        failed = store_document_items(items)
+        for result in results:
+            error = failed.get(result.get('document_id'))
+            if error:
+                result['ok'] = False
+                result['error'] = error
+        
+        # Hand pending summaries to the summarizer function (or summarize inline
+        # when none is configured or the inline summary failed)
+        pending = [
+            item['document_id'] for item in items
+            if item.get('summary_status') == 'pending' and item['document_id'] not in failed
+        ]
+        if pending:
+            summary_errors = dict(zip(pending, EXECUTOR.map(request_summary, pending)))
+            for result in results:
+                error = summary_errors.get(result.get('document_id'))
+                if error:
+                    result['ok'] = False
+                    result['error'] = error
+        
+        logger.info("Processing completed: %d/%d succeeded",
+                    sum(1 for result in results if result['ok']), len(results))
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': _json_dumps({
                 'message': 'Documents processed successfully',
                 'results': results
-            })
+            }).decode('utf-8')
         }
         
     except Exception as e:
-        logger.error(f"Error processing event: {str(e)}")
+        logger.exception("Error processing event")
         return {
             'statusCode': 500,
             'body': json.dumps({
@@ -68,75 +306,96 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
 
-def process_s3_record(record: Dict[str, Any]) -> Dict[str, Any]:
+def process_s3_record(record: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Process a single S3 record (uploaded document).
     
     Args:
         record: S3 event record
+        deadline: time.monotonic() value by which long-running steps must finish
         
     Returns:
-        Dict containing processing results for this record
+        Compact result for this record ('document_id' and 'ok', or 'key', 'ok'
+        and 'error' on failure), including the DynamoDB item to store under
+        'item' when a new document was processed
     """
     try:
         # Extract S3 information
         bucket = record['s3']['bucket']['name']
         key = unquote_plus(record['s3']['object']['key'])
         
-        logger.info(f"Processing document: {key} from bucket: {bucket}")
+        logger.info("Processing document: %s from bucket: %s", key, bucket)
         
-        # Generate unique document ID
+        # Generate unique document ID and a single timestamp for this record
         document_id = str(uuid.uuid4())
+        now = datetime.now()
         
         # Get document metadata
-        document_metadata = get_document_metadata(bucket, key)
+        document_metadata = get_document_metadata(bucket, key, now)
+        
+        # Skip objects we have already processed (S3 may redeliver events)
+        etag = document_metadata.get('etag')
+        existing = find_document_by_etag(etag, bucket, key) if etag else None
+        if existing:
+            logger.info("Document %s already processed as %s", key, existing['document_id'])
+            return {'document_id': existing['document_id'], 'ok': True}
         
-        # Extract text from document
-        extracted_text = extract_text_from_document(bucket, key)
+        # Extract text and generate summary (a single Bedrock call for vision files);
+        # other summaries are generated asynchronously when a summarizer is configured
+        extracted_text, summary, extracted = extract_and_summarize(
+            bucket, key, document_metadata, summarize=not SUMMARIZE_FN, deadline=deadline
+        )
         
-        # Generate summary using Bedrock
-        summary = generate_summary_with_bedrock(extracted_text)
+        # Compress the raw text and keep it out of DynamoDB if it is still large
+        raw_text_attributes = store_raw_text(document_id, extracted_text)
         
-        # Store document data and summary in DynamoDB
-        store_document_data(
+        # Build the DynamoDB item; the handler writes all items in one batch
+        item = build_document_item(
             document_id=document_id,
             bucket=bucket,
             key=key,
             metadata=document_metadata,
             raw_text=extracted_text,
-            summary=summary
+            summary=summary,
+            now=now,
+            raw_text_attributes=raw_text_attributes,
+            extracted=extracted
         )
         
-        return {
-            'document_id': document_id,
-            'bucket': bucket,
-            'key': key,
-            'status': 'processed',
-            'text_length': len(extracted_text),
-            'summary_length': len(summary)
-        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processed %s from bucket %s: document_id=%s text_length=%d summary_status=%s",
+                         key, bucket, document_id, len(extracted_text), item['summary_status'])
+        
+        # Failed extractions are stored with the error as their text, but the
+        # record is reported as failed
+        if not extracted:
+            return {'document_id': document_id, 'ok': False, 'error': extracted_text, 'item': item}
+        return {'document_id': document_id, 'ok': True, 'item': item}
         
     except Exception as e:
-        logger.error(f"Error processing S3 record: {str(e)}")
+        logger.exception("Error processing S3 record")
         return {
-            'bucket': record['s3']['bucket']['name'],
             'key': unquote_plus(record['s3']['object']['key']),
-            'status': 'error',
+            'ok': False,
             'error': str(e)
         }
 
 
-def get_document_metadata(bucket: str, key: str) -> Dict[str, Any]:
+def get_document_metadata(bucket: str, key: str,
+                          now: Optional[datetime] = None) -> Dict[str, Any]:
     """
     Get metadata for the uploaded document.
     
     Args:
         bucket: S3 bucket name
         key: S3 object key
+        now: Timestamp used when S3 does not report a last-modified time
         
     Returns:
         Dict containing document metadata
     """
+    now = now or datetime.now()
+    
     try:
         response = s3_client.head_object(Bucket=bucket, Key=key)
         
@@ -148,87 +407,275 @@ def get_document_metadata(bucket: str, key: str) -> Dict[str, Any]:
         return {
             'content_type': content_type,
             'content_length': response.get('ContentLength', 0),
-            'last_modified': response.get('LastModified', datetime.now()).isoformat(),
+            'last_modified': response.get('LastModified', now).isoformat(),
             'etag': response.get('ETag', '').strip('"'),
             'metadata': response.get('Metadata', {})
         }
         
-    except Exception as e:
-        logger.error(f"Error getting document metadata: {str(e)}")
+    except Exception:
+        logger.exception("Error getting document metadata")
         return {
             'content_type': 'unknown',
             'content_length': 0,
-            'last_modified': datetime.now().isoformat(),
+            'last_modified': now.isoformat(),
             'etag': '',
             'metadata': {}
         }
 
 
-def extract_text_from_document(bucket: str, key: str) -> str:
+def extract_and_summarize(bucket: str, key: str,
+                          metadata: Optional[Dict[str, Any]] = None,
+                          summarize: bool = True,
+                          deadline: Optional[float] = None) -> Tuple[str, Optional[str], bool]:
+    """
+    Extract text from a document and summarize it.
+    
+    PDFs and images are read with Textract when it is confident in the result.
+    Other vision-eligible files are extracted and summarized by a single Bedrock
+    call; everything else (or a vision response that is not the expected JSON)
+    is summarized separately with generate_summary_with_bedrock.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        metadata: Document metadata from get_document_metadata, if available
+        summarize: Generate a separate summary when the fused call does not
+            provide one; if False the summary is left to the summarizer function
+        deadline: time.monotonic() value by which long-running steps must finish
+        
+    Returns:
+        Tuple of (extracted text or an error message, summary or None if it is
+        still pending, whether the text was extracted); failed extractions are
+        not summarized
+    """
+    file_extension = _ext(key)
+    
+    if file_extension in _TEXTRACT_EXTS:
+        extracted_text = extract_text_with_textract(bucket, key, metadata, deadline)
+        if extracted_text is not None:
+            return extracted_text, generate_summary_with_bedrock(extracted_text) if summarize else None, True
+    
+    if file_extension in _VISION_EXTS:
+        logger.info("Extracting and summarizing document: %s", key)
+        output, extracted = extract_text_with_bedrock_data_automation(
+            bucket, key, metadata, summarize=True
+        )
+        if not extracted:
+            return output, None, False
+        
+        fused = _parse_text_and_summary(output)
+        if fused is not None:
+            extracted_text, summary = fused
+            if summary is not None:
+                return extracted_text, summary, True
+        elif _FUSED_KEY.search(output):
+            # Truncated or malformed JSON; never store the envelope as the text
+            logger.info("Unreadable fused response for %s, extracting plain text", key)
+            extracted_text, extracted = extract_text_with_bedrock_data_automation(bucket, key, metadata)
+            if not extracted:
+                return extracted_text, None, False
+        else:
+            extracted_text = output
+    else:
+        extracted_text, extracted = extract_text_from_document(bucket, key, metadata)
+        if not extracted:
+            return extracted_text, None, False
+    
+    return extracted_text, generate_summary_with_bedrock(extracted_text) if summarize else None, True
+
+
+def _parse_text_and_summary(output: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Parse the fused {"text": ..., "summary": ...} response of the vision model.
+    
+    If the object as a whole is not valid JSON (e.g. it was cut off at
+    max_tokens), the "text" value is still recovered on its own.
+    
+    Args:
+        output: Raw model output
+        
+    Returns:
+        Tuple of (extracted text, summary or None if only the text could be
+        recovered), or None if no complete "text" value was found
+    """
+    # Tolerate code fences or stray prose before and after the JSON object
+    start = output.find('{')
+    if start >= 0:
+        try:
+            parsed, _ = _json_decoder.raw_decode(output, start)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict) and isinstance(parsed.get('text'), str):
+            summary = parsed.get('summary')
+            return parsed['text'].strip(), summary.strip() if isinstance(summary, str) else None
+    
+    # Decode just the "text" string value, which may be followed by anything
+    for match in _FUSED_KEY.finditer(output):
+        if match.group(1) != 'text':
+            continue
+        try:
+            text, _ = json.decoder.scanstring(output, match.end())
+        except ValueError:
+            return None
+        return text.strip(), None
+    return None
+
+
+def extract_text_with_textract(bucket: str, key: str,
+                               metadata: Optional[Dict[str, Any]] = None,
+                               deadline: Optional[float] = None) -> Optional[str]:
+    """
+    Extract text using Amazon Textract.
+    
+    Documents within the synchronous size limit use the synchronous API.
+    Multi-page or larger PDFs go through an asynchronous text detection job.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        metadata: Document metadata from get_document_metadata, if available
+        deadline: time.monotonic() value by which the asynchronous job must finish
+        
+    Returns:
+        Extracted text, or None if Bedrock vision should be used instead
+        
+    Raises:
+        TimeoutError: If the asynchronous job does not finish in time; there is
+            then no time left to fall back to Bedrock
+    """
+    is_pdf = _ext(key) == 'pdf'
+    fits_sync = ((metadata or {}).get('content_length') or 0) <= TEXTRACT_SYNC_MAX_BYTES
+    
+    try:
+        blocks = None
+        if fits_sync:
+            try:
+                response = textract_client.detect_document_text(
+                    Document={'S3Object': {'Bucket': bucket, 'Name': key}}
+                )
+                blocks = response.get('Blocks', [])
+            except ClientError as e:
+                # The synchronous API only accepts single-page PDFs
+                if not is_pdf or e.response.get('Error', {}).get('Code') != 'UnsupportedDocumentException':
+                    raise
+        
+        if blocks is None:
+            if not is_pdf:
+                return None
+            blocks = _textract_async_blocks(bucket, key, deadline)
+    except TimeoutError:
+        raise
+    except Exception:
+        logger.exception("Error with Textract")
+        return None
+    
+    lines = [block for block in blocks if block.get('BlockType') == 'LINE']
+    if not lines:
+        logger.info("Textract found no text in %s, using Bedrock", key)
+        return None
+    
+    confidence = sum(line.get('Confidence', 0.0) for line in lines) / len(lines)
+    if confidence < TEXTRACT_MIN_CONFIDENCE:
+        logger.info("Textract confidence %.1f too low for %s, using Bedrock", confidence, key)
+        return None
+    
+    extracted_text = '\n'.join(line.get('Text', '') for line in lines)
+    logger.info("Successfully extracted text using Textract: %d characters", len(extracted_text))
+    return extracted_text
+
+
+def _textract_async_blocks(bucket: str, key: str,
+                           deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Run an asynchronous Textract text detection job and collect its blocks.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        deadline: time.monotonic() value after which to stop waiting; without
+            one, polling continues until the job finishes
+        
+    Returns:
+        All blocks returned by the job, in page order
+    """
+    job = textract_client.start_document_text_detection(
+        DocumentLocation={'S3Object': {'Bucket': bucket, 'Name': key}}
+    )
+    job_id = job['JobId']
+    
+    started = time.monotonic()
+    
+    while True:
+        response = textract_client.get_document_text_detection(JobId=job_id)
+        status = response['JobStatus']
+        if status != 'IN_PROGRESS':
+            break
+        if deadline is not None and time.monotonic() + TEXTRACT_POLL_INTERVAL > deadline:
+            raise TimeoutError(
+                f"Textract job {job_id} did not finish in {time.monotonic() - started:.0f}s"
+            )
+        time.sleep(TEXTRACT_POLL_INTERVAL)
+    
+    if status not in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
+        raise RuntimeError(f"Textract job {job_id} finished with status {status}")
+    
+    blocks = list(response.get('Blocks', []))
+    next_token = response.get('NextToken')
+    while next_token:
+        response = textract_client.get_document_text_detection(JobId=job_id, NextToken=next_token)
+        blocks.extend(response.get('Blocks', []))
+        next_token = response.get('NextToken')
+    
+    return blocks
+
+
+def extract_text_from_document(bucket: str, key: str,
+                               metadata: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
     """
     Extract text from document using AWS Bedrock Data Automation.
     
     Args:
         bucket: S3 bucket name
         key: S3 object key
+        metadata: Document metadata from get_document_metadata, if available
         
     Returns:
-        Extracted text from the document
+        Tuple of (extracted text or an error message, whether extraction succeeded)
     """
     try:
-        logger.info(f"Extracting text from document: {key}")
+        logger.info("Extracting text from document: %s", key)
         
         # Get file extension to determine processing method
-        file_extension = key.lower().split('.')[-1]
-        
-        if file_extension in ['pdf', 'png', 'jpg', 'jpeg', 'tiff', 'gif', 'bmp']:
+        if _ext(key) in _VISION_EXTS:
             # Use Bedrock Data Automation for image and PDF files
-            return extract_text_with_bedrock_data_automation(bucket, key)
+            return extract_text_with_bedrock_data_automation(bucket, key, metadata)
         else:
             # For other file types, try to read directly
             return extract_text_directly(bucket, key)
             
     except Exception as e:
-        logger.error(f"Error extracting text: {str(e)}")
-        return f"Error extracting text: {str(e)}"
+        logger.exception("Error extracting text")
+        return f"Error extracting text: {str(e)}", False
 
 
-def extract_text_with_bedrock_data_automation(bucket: str, key: str) -> str:
+def extract_text_with_bedrock_data_automation(bucket: str, key: str,
+                                              metadata: Optional[Dict[str, Any]] = None,
+                                              summarize: bool = False) -> Tuple[str, bool]:
     """
     Extract text using AWS Bedrock Data Automation.
     
     Args:
         bucket: S3 bucket name
         key: S3 object key
+        metadata: Document metadata from get_document_metadata, if available
+        summarize: Ask the model for a JSON object with "text" and "summary" keys
         
     Returns:
-        Extracted text
+        Tuple of (extracted text, or raw JSON model output if summarize is set,
+        or an error message; whether extraction succeeded). Documents are never
+        decoded directly, since their bytes are binary.
     """
     try:
-        # Use Bedrock Data Automation to extract document text
-        # First, we'll use a vision-capable model to extract text from the document
-        
-        # Get the document content
-        document_response = s3_client.get_object(Bucket=bucket, Key=key)
-        document_content = document_response['Body'].read()
-        
-        # Encode document content to base64 for Bedrock
-        import base64
-        document_b64 = base64.b64encode(document_content).decode('utf-8')
-        
-        # Determine the media type based on file extension
-        file_extension = key.lower().split('.')[-1]
-        media_type_map = {
-            'pdf': 'application/pdf',
-            'png': 'image/png',
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'tiff': 'image/tiff',
-            'gif': 'image/gif',
-            'bmp': 'image/bmp'
-        }
-        media_type = media_type_map.get(file_extension, 'application/octet-stream')
-        
         # Create a prompt for text extraction
         prompt = """
         Please extract all text content from this document. 
@@ -237,35 +684,60 @@ def extract_text_with_bedrock_data_automation(bucket: str, key: str) -> str:
         If there are tables, preserve their structure.
         If there are multiple sections, clearly separate them.
         
-        Return only the extracted text content, without any additional commentary.
         """
+        max_tokens = OCR_MAX_TOKENS
+        if summarize:
+            prompt += """Return a JSON object with two keys: "text" (full extraction) and "summary" (<=200 words).
+        """
+            max_tokens += FUSED_SUMMARY_MAX_TOKENS
+        else:
+            prompt += """Return only the extracted text content, without any additional commentary.
+        """
+        
+        # Let Bedrock read the document straight from S3 when possible
+        extracted_text = _extract_text_with_converse(bucket, key, prompt, max_tokens)
+        if extracted_text:
+            return extracted_text, True
+        if extracted_text is not None:
+            return "Unable to extract text - empty response from Bedrock", False
+        
+        # Otherwise fall back to sending the document inline
+        # Get the document content, reusing the size/ETag we already fetched
+        metadata = metadata or {}
+        document_content = _parallel_get(
+            bucket, key,
+            size=metadata.get('content_length') or None,
+            etag=metadata.get('etag') or None
+        )
+        
+        # Encode document content to base64 for Bedrock
+        document_b64 = b2a_base64(document_content, newline=False).decode('ascii')
+        
+        # Determine the media type based on file extension
+        media_type = _MEDIA_TYPE.get(_ext(key), 'application/octet-stream')
         
         # Prepare the request for Claude 3 with vision capabilities
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 8000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": prompt
-                        },
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": media_type,
-                                "data": document_b64
-                            }
+        request_body = _OCR_REQ_TEMPLATE.copy()
+        request_body["max_tokens"] = max_tokens
+        request_body["messages"] = [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": prompt
+                    },
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": media_type,
+                            "data": document_b64
                         }
-                    ]
-                }
-            ],
-            "temperature": 0.1,
-            "top_p": 0.9
-        }
+                    }
+                ]
+            }
+        ]
         
         # Use the environment variable for model ID
         model_id = BEDROCK_MODEL_ID
@@ -273,60 +745,204 @@ def extract_text_with_bedrock_data_automation(bucket: str, key: str) -> str:
         # Call Bedrock
         response = bedrock_client.invoke_model(
             modelId=model_id,
-            body=json.dumps(request_body),
+            body=_json_dumps(request_body),
             contentType='application/json'
         )
         
         # Parse response
-        response_body = json.loads(response['body'].read())
+        response_body = _json_loads(response['body'].read())
         
         if 'content' in response_body and response_body['content']:
             extracted_text = response_body['content'][0]['text']
-            logger.info(f"Successfully extracted text using Bedrock Data Automation: {len(extracted_text)} characters")
-            return extracted_text.strip()
+            logger.info("Successfully extracted text using Bedrock Data Automation: %d characters", len(extracted_text))
+            return extracted_text.strip(), True
         else:
             logger.warning("Empty response from Bedrock Data Automation")
-            return "Unable to extract text - empty response from Bedrock"
+            return "Unable to extract text - empty response from Bedrock", False
             
     except Exception as e:
-        logger.error(f"Error with Bedrock Data Automation: {str(e)}")
-        # Fallback to direct reading
-        return extract_text_directly(bucket, key)
+        logger.exception("Error with Bedrock Data Automation")
+        return f"Error extracting text: {str(e)}", False
 
 
-def extract_text_directly(bucket: str, key: str) -> str:
+def _extract_text_with_converse(bucket: str, key: str, prompt: str,
+                                max_tokens: int = OCR_MAX_TOKENS) -> Optional[str]:
     """
-    Extract text directly from S3 object for text-based files.
+    Extract text with the Bedrock Converse API, referencing the document by S3 URI
+    so it never has to be downloaded into the Lambda.
     
     Args:
         bucket: S3 bucket name
         key: S3 object key
+        prompt: Text extraction prompt
+        max_tokens: Maximum number of tokens to generate
         
     Returns:
-        Extracted text
+        Extracted text ('' if the model returned none), or None if the document
+        must be sent inline instead
     """
+    global _converse_s3_supported
+    
+    block_type, fmt = _CONVERSE_FORMAT.get(_ext(key), (None, None))
+    if block_type is None or not _converse_s3_supported:
+        return None
+    
+    s3_location = {'uri': f's3://{bucket}/{key}'}
+    if ACCOUNT_ID:
+        s3_location['bucketOwner'] = ACCOUNT_ID
+    
+    block = {'format': fmt, 'source': {'s3Location': s3_location}}
+    if block_type == 'document':
+        block['name'] = 'document'
+    
     try:
-        # Get the file from S3
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        content = response['Body'].read()
+        response = bedrock_client.converse(
+            modelId=BEDROCK_MODEL_ID,
+            messages=[
+                {
+                    'role': 'user',
+                    'content': [
+                        {'text': prompt},
+                        {block_type: block}
+                    ]
+                }
+            ],
+            inferenceConfig={
+                'maxTokens': max_tokens,
+                'temperature': _OCR_REQ_TEMPLATE['temperature'],
+                'topP': _OCR_REQ_TEMPLATE['top_p']
+            }
+        )
+    except ClientError as e:
+        error = e.response.get('Error', {})
+        if error.get('Code') != 'ValidationException':
+            raise
+        if _CONVERSE_S3_REJECTED.search(error.get('Message', '')):
+            logger.info("Converse rejected S3 document reference, sending inline from now on: %s", e)
+            _converse_s3_supported = False
+        else:
+            # Problem with this document (size, format, length); retry it inline
+            logger.info("Converse rejected document, sending it inline: %s", e)
+        return None
+    except ParamValidationError as e:
+        # Older botocore releases do not know about s3Location
+        logger.info("Converse S3 document reference unsupported, sending inline from now on: %s", e)
+        _converse_s3_supported = False
+        return None
+    
+    content = response.get('output', {}).get('message', {}).get('content', [])
+    if content and 'text' in content[0]:
+        extracted_text = content[0]['text']
+        logger.info("Successfully extracted text using Bedrock Converse: %d characters", len(extracted_text))
+        return extracted_text.strip()
+    
+    logger.warning("Empty response from Bedrock Converse")
+    return ''
+
+
+def _parallel_get(bucket: str, key: str, size: Optional[int] = None,
+                  etag: Optional[str] = None, part: int = S3_PART_SIZE,
+                  workers: int = S3_RANGE_WORKERS) -> bytearray:
+    """
+    Download an S3 object using concurrent byte-range GETs.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        size: Object size in bytes (fetched with HEAD if not provided)
+        etag: Object ETag, used to make sure every part comes from the same version
+        part: Size of each ranged GET in bytes
+        workers: Maximum number of concurrent ranged GETs
         
-        # Try to decode as text
+    Returns:
+        Object content
+    """
+    if size is None or etag is None:
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+        size = head['ContentLength']
+        etag = head['ETag'].strip('"')
+    
+    buffer = bytearray(size)
+    ranges = [(start, min(start + part - 1, size - 1)) for start in range(0, size, part)]
+    
+    def fetch(byte_range):
+        start, end = byte_range
+        response = s3_client.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f'bytes={start}-{end}',
+            IfMatch=f'"{etag}"'
+        )
+        buffer[start:end + 1] = response['Body'].read()
+    
+    # A dedicated pool avoids starving EXECUTOR, which is running this record
+    with ThreadPoolExecutor(max_workers=min(workers, max(len(ranges), 1))) as pool:
+        list(pool.map(fetch, ranges))
+    
+    return buffer
+
+
+def extract_text_directly(bucket: str, key: str) -> Tuple[str, bool]:
+    """
+    Extract text directly from S3 object for text-based files.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        
+    Returns:
+        Tuple of (extracted text or an error message, whether extraction succeeded)
+    """
+    try:
+        # Try to decode as UTF-8, re-reading as latin-1 (which accepts any byte) if that fails
         try:
-            text = content.decode('utf-8')
+            text = _stream_decode(bucket, key, 'utf-8')
         except UnicodeDecodeError:
-            try:
-                text = content.decode('latin-1')
-            except UnicodeDecodeError:
-                text = content.decode('utf-8', errors='ignore')
+            text = _stream_decode(bucket, key, 'latin-1')
         
-        return text
+        return text, True
         
     except Exception as e:
-        logger.error(f"Error reading file directly: {str(e)}")
-        return f"Unable to extract text from file: {str(e)}"
+        logger.exception("Error reading file directly")
+        return f"Unable to extract text from file: {str(e)}", False
 
 
-def generate_summary_with_bedrock(text: str) -> str:
+def _stream_decode(bucket: str, key: str, encoding: str) -> str:
+    """
+    Decode an S3 object chunk by chunk without holding the raw bytes in memory.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        encoding: Text encoding to decode with
+        
+    Returns:
+        Decoded text, truncated to MAX_TEXT_LEN characters
+    """
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    body = response['Body']
+    decoder = codecs.getincrementaldecoder(encoding)()
+    
+    parts = []
+    length = 0
+    try:
+        for chunk in body.iter_chunks(TEXT_CHUNK_SIZE):
+            part = decoder.decode(chunk)
+            parts.append(part)
+            length += len(part)
+            if length >= MAX_TEXT_LEN:
+                logger.info("Truncating %s at %d characters", key, MAX_TEXT_LEN)
+                break
+        else:
+            parts.append(decoder.decode(b'', final=True))
+    finally:
+        body.close()
+    
+    text = ''.join(parts)
+    return text[:MAX_TEXT_LEN] if len(text) > MAX_TEXT_LEN else text
+
+
+def generate_summary_with_bedrock(text: str) -> Optional[str]:
     """
     Generate a summary of the extracted text using AWS Bedrock.
     
@@ -334,64 +950,167 @@ def generate_summary_with_bedrock(text: str) -> str:
         text: The extracted text to summarize
         
     Returns:
-        Generated summary
+        Generated summary, or None if generation failed; the summary is then
+        left pending and retried by request_summary
     """
     try:
-        if not text or len(text.strip()) < 50:
-            return "Text too short to summarize effectively."
+        return invoke_summary_model(text)
+    except Exception:
+        logger.exception("Error generating summary with Bedrock")
+        return None
+
+
+def invoke_summary_model(text: str) -> str:
+    """
+    Generate a summary of the extracted text using AWS Bedrock, raising on failure.
+    
+    Args:
+        text: The extracted text to summarize
+        
+    Returns:
+        Generated summary
         
-        # Prepare the prompt for Claude
-        prompt = f"""
+    Raises:
+        RuntimeError: If the model returned no content
+    """
+    # Limit text to avoid token limits; only slice when we have to
+    snippet = text[:MAX_SUMMARY_CHARS] if len(text) > MAX_SUMMARY_CHARS else text
+    
+    if not snippet or len(snippet.strip()) < 50:
+        return "Text too short to summarize effectively."
+    
+    # Prepare the prompt for Claude
+    prompt = ''.join([
+        """
         Please provide a comprehensive summary of the following document. 
         Include the main topics, key points, and any important details.
         Keep the summary clear and well-structured.
         
         Document text:
-        {text[:8000]}  # Limit text to avoid token limits
+        """,
+        snippet,
+        """
         
         Summary:
         """
-        
-        # Prepare the request body for Claude
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.3,
-            "top_p": 0.9
+    ])
+    
+    # Prepare the request body for Claude
+    request_body = _SUM_REQ_TEMPLATE.copy()
+    request_body["messages"] = [
+        {
+            "role": "user",
+            "content": prompt
         }
+    ]
+    
+    # Call Bedrock
+    response = bedrock_client.invoke_model(
+        modelId=BEDROCK_MODEL_ID,
+        body=_json_dumps(request_body),
+        contentType='application/json'
+    )
+    
+    # Parse response
+    response_body = _json_loads(response['body'].read())
+    
+    if 'content' in response_body and response_body['content']:
+        summary = response_body['content'][0]['text']
+        return summary.strip()
+    
+    raise RuntimeError("Unable to generate summary - empty response from model.")
+
+
+def _zstd_compressor() -> Any:
+    """Return this thread's zstd compressor."""
+    if not hasattr(_zstd_local, 'compressor'):
+        _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return _zstd_local.compressor
+
+
+def _zstd_decompressor() -> Any:
+    """Return this thread's zstd decompressor."""
+    if not hasattr(_zstd_local, 'decompressor'):
+        _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return _zstd_local.decompressor
+
+
+def store_raw_text(document_id: str, raw_text: str) -> Dict[str, Any]:
+    """
+    Prepare raw text for storage, compressing it with zstd when available and
+    writing it to S3 if it is too large to keep inline in DynamoDB.
+    
+    Args:
+        document_id: Unique document identifier
+        raw_text: Extracted raw text
         
-        # Call Bedrock
-        response = bedrock_client.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=json.dumps(request_body),
-            contentType='application/json'
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
+    Returns:
+        DynamoDB attributes describing where and how the raw text is stored
+    """
+    raw_bytes = raw_text.encode('utf-8')
+    compressed = zstandard is not None
+    if compressed:
+        raw_bytes = _zstd_compressor().compress(raw_bytes)
+    
+    if len(raw_bytes) <= RAW_TEXT_INLINE_LIMIT:
+        if compressed:
+            return {'raw_text_zstd': raw_bytes, 'raw_text_compression': 'zstd'}
+        return {'raw_text': raw_text}
+    
+    text_key = f"{DERIVED_TEXT_PREFIX}{document_id}.txt"
+    put_args = {'ContentType': 'text/plain; charset=utf-8'}
+    if compressed:
+        text_key += '.zst'
+        put_args['ContentEncoding'] = 'zstd'
+    
+    s3_client.put_object(
+        Bucket=S3_BUCKET_NAME,
+        Key=text_key,
+        Body=raw_bytes,
+        **put_args
+    )
+    logger.info("Raw text stored in S3: %s (%d bytes)", text_key, len(raw_bytes))
+    
+    attributes = {'raw_text_s3_key': text_key}
+    if compressed:
+        attributes['raw_text_compression'] = 'zstd'
+    return attributes
+
+
+def read_raw_text(item: Dict[str, Any]) -> Optional[str]:
+    """
+    Read the raw text of a stored document item, wherever it was stored.
+    
+    Args:
+        item: DynamoDB item for the document
         
-        if 'content' in response_body and response_body['content']:
-            summary = response_body['content'][0]['text']
-            return summary.strip()
-        else:
-            return "Unable to generate summary - empty response from model."
-            
-    except Exception as e:
-        logger.error(f"Error generating summary with Bedrock: {str(e)}")
-        return f"Error generating summary: {str(e)}"
+    Returns:
+        Raw text or None if the item has none
+    """
+    if 'raw_text' in item:
+        return item['raw_text']
+    
+    if 'raw_text_zstd' in item:
+        data = item['raw_text_zstd']
+        data = getattr(data, 'value', data)  # boto3 returns Binary wrappers
+    elif 'raw_text_s3_key' in item:
+        response = s3_client.get_object(Bucket=S3_BUCKET_NAME, Key=item['raw_text_s3_key'])
+        data = response['Body'].read()
+    else:
+        return None
+    
+    if item.get('raw_text_compression') == 'zstd':
+        data = _zstd_decompressor().decompress(data)
+    return data.decode('utf-8')
 
 
-def store_document_data(document_id: str, bucket: str, key: str, 
-                       metadata: Dict[str, Any], raw_text: str, 
-                       summary: str) -> None:
+def build_document_item(document_id: str, bucket: str, key: str,
+                        metadata: Dict[str, Any], raw_text: str,
+                        summary: Optional[str], now: Optional[datetime] = None,
+                        raw_text_attributes: Optional[Dict[str, Any]] = None,
+                        extracted: bool = True) -> Dict[str, Any]:
     """
-    Store document data and summary in DynamoDB.
+    Build the DynamoDB item for a processed document.
     
     Args:
         document_id: Unique document identifier
@@ -399,31 +1118,178 @@ def store_document_data(document_id: str, bucket: str, key: str,
         key: S3 object key
         metadata: Document metadata
         raw_text: Extracted raw text
-        summary: Generated summary
+        summary: Generated summary, or None if it is still pending
+        now: Processing timestamp for the record
+        raw_text_attributes: Raw text storage attributes from store_raw_text;
+            the text is stored inline and uncompressed if not given
+        extracted: Whether text extraction succeeded; if not, raw_text is the
+            error message and the document is not summarized
+        
+    Returns:
+        DynamoDB item
     """
-    try:
-        # Prepare DynamoDB item
-        item = {
-            'document_id': document_id,
-            'bucket': bucket,
-            'object_key': key,
-            'upload_timestamp': int(datetime.now().timestamp()),
-            'metadata': metadata,
-            'raw_text': raw_text,
-            'summary': summary,
-            'processed_at': datetime.now().isoformat(),
-            'text_length': len(raw_text),
-            'summary_length': len(summary)
-        }
+    now = now or datetime.now()
+    item = {
+        'document_id': document_id,
+        'bucket': bucket,
+        'object_key': key,
+        'upload_timestamp': int(now.timestamp()),
+        'metadata': metadata,
+        'processed_at': now.isoformat(),
+        'text_length': len(raw_text),
+        'extraction_status': 'complete' if extracted else 'failed'
+    }
+    
+    if not extracted:
+        item['summary_status'] = 'skipped'
+    elif summary is None:
+        item['summary_status'] = 'pending'
+    else:
+        item['summary'] = summary
+        item['summary_length'] = len(summary)
+        item['summary_status'] = 'complete'
+    
+    # Top-level ETag backs the idempotency index (index keys cannot be empty).
+    # It is only set once the document was fully processed, so failed runs are
+    # retried on redelivery; pending summaries set it in summarize_document.
+    if metadata.get('etag') and item['summary_status'] == 'complete':
+        item['etag'] = metadata['etag']
+    
+    item.update(raw_text_attributes or {'raw_text': raw_text})
+    
+    return item
+
+
+def store_document_items(items: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Store document items in DynamoDB using batched writes.
+    
+    Items are written in chunks of up to 25 per BatchWriteItem call; the batch
+    writer resubmits unprocessed items and throttled calls are retried by the
+    client's adaptive retry mode. If a chunk is rejected (e.g. one item is
+    over the 400 KB limit), its items are written one at a time so only the
+    offending items fail. Raw text offloaded to S3 for a failed item is deleted.
+    
+    Args:
+        items: DynamoDB items built by build_document_item
         
-        # Store in DynamoDB
-        table.put_item(Item=item)
+    Returns:
+        Error messages keyed by the document_id of each item that was not stored
+    """
+    failed = {}
+    
+    for start in range(0, len(items), DYNAMODB_BATCH_SIZE):
+        chunk = items[start:start + DYNAMODB_BATCH_SIZE]
+        try:
+            with table.batch_writer(overwrite_by_pkeys=['document_id']) as batch:
+                for item in chunk:
+                    batch.put_item(Item=item)
+            continue
+        except Exception:
+            logger.exception("Error storing document batch, retrying items individually")
         
-        logger.info(f"Document data stored successfully: {document_id}")
+        for item in chunk:
+            try:
+                table.put_item(Item=item)
+            except Exception as e:
+                logger.exception("Error storing document data: %s", item['document_id'])
+                failed[item['document_id']] = f"Error storing document data: {str(e)}"
+                _discard_raw_text(item)
+    
+    logger.info("Document data stored: %d/%d items", len(items) - len(failed), len(items))
+    return failed
+
+
+def _discard_raw_text(item: Dict[str, Any]) -> None:
+    """
+    Delete raw text offloaded to S3 for an item that could not be stored.
+    
+    Args:
+        item: DynamoDB item built by build_document_item
+    """
+    text_key = item.get('raw_text_s3_key')
+    if not text_key:
+        return
+    
+    try:
+        s3_client.delete_object(Bucket=S3_BUCKET_NAME, Key=text_key)
+    except Exception:
+        logger.exception("Error deleting orphaned raw text: %s", text_key)
+
+
+def request_summary(document_id: str) -> Optional[str]:
+    """
+    Asynchronously invoke the summarizer function for a stored document,
+    summarizing inline if none is configured or the invocation cannot be queued.
+    
+    Args:
+        document_id: Document identifier
         
+    Returns:
+        Error message if the summary could neither be requested nor generated
+    """
+    if SUMMARIZE_FN:
+        try:
+            lambda_client.invoke(
+                FunctionName=SUMMARIZE_FN,
+                InvocationType='Event',
+                Payload=_json_dumps({'document_id': document_id})
+            )
+            return None
+        except Exception:
+            logger.exception("Error requesting summary for %s, summarizing inline", document_id)
+    
+    try:
+        summarize_document(document_id)
+        return None
     except Exception as e:
-        logger.error(f"Error storing document data: {str(e)}")
-        raise
+        logger.exception("Error summarizing document inline: %s", document_id)
+        return f"Error generating summary: {str(e)}"
+
+
+def summarize_document(document_id: str) -> Optional[str]:
+    """
+    Generate the summary for a stored document and mark it complete.
+    
+    Uses the table's low-level client, which (unlike the resource) is safe to
+    share between EXECUTOR threads. On failure the item is left 'pending'.
+    
+    Args:
+        document_id: Document identifier
+        
+    Returns:
+        Generated summary, or None if the document does not exist
+    """
+    client = table.meta.client
+    response = client.get_item(TableName=DYNAMODB_TABLE_NAME, Key={'document_id': document_id})
+    item = response.get('Item')
+    if not item:
+        return None
+    
+    raw_text = read_raw_text(item) or ''
+    summary = invoke_summary_model(raw_text)
+    
+    update_expression = 'SET summary = :summary, summary_length = :length, summary_status = :status'
+    values = {
+        ':summary': summary,
+        ':length': len(summary),
+        ':status': 'complete'
+    }
+    
+    # Record the ETag now that the document is fully processed
+    etag = item.get('metadata', {}).get('etag')
+    if etag and item.get('extraction_status') == 'complete':
+        update_expression += ', etag = :etag'
+        values[':etag'] = etag
+    
+    client.update_item(
+        TableName=DYNAMODB_TABLE_NAME,
+        Key={'document_id': document_id},
+        UpdateExpression=update_expression,
+        ExpressionAttributeValues=values
+    )
+    logger.info("Summary stored for document: %s", document_id)
+    return summary
 
 
 def get_document_by_id(document_id: str) -> Optional[Dict[str, Any]]:
@@ -439,6 +1305,41 @@ def get_document_by_id(document_id: str) -> Optional[Dict[str, Any]]:
     try:
         response = table.get_item(Key={'document_id': document_id})
         return response.get('Item')
-    except Exception as e:
-        logger.error(f"Error retrieving document: {str(e)}")
-        return None 
\ No newline at end of file
+    except Exception:
+        logger.exception("Error retrieving document")
+        return None
+
+
+def find_document_by_etag(etag: str, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a previously processed document for the same object and ETag.
+    
+    Uses the table's low-level client, which (unlike the resource) is safe to
+    share between EXECUTOR threads.
+    
+    Args:
+        etag: S3 object ETag (without quotes)
+        bucket: S3 bucket name
+        key: S3 object key
+        
+    Returns:
+        Projected document data or None if not found
+    """
+    try:
+        response = table.meta.client.query(
+            TableName=DYNAMODB_TABLE_NAME,
+            IndexName='EtagIndex',
+            KeyConditionExpression='etag = :etag AND object_key = :key',
+            FilterExpression='#bucket = :bucket',
+            ExpressionAttributeNames={'#bucket': 'bucket'},
+            ExpressionAttributeValues={
+                ':etag': etag,
+                ':key': key,
+                ':bucket': bucket
+            }
+        )
+        items = response.get('Items', [])
+        return items[0] if items else None
+    except Exception:
+        logger.exception("Error looking up document by ETag")
+        return None
\ No newline at end of file
@@ -0,0 +1,45 @@
+import json
+from typing import Dict, Any
+
+from lambda_function import logger, summarize_document
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler that summarizes a stored document and updates its item.
+
+    Invoked asynchronously by the document processor once the document's
+    text has been written to DynamoDB. Failures are raised so Lambda's async
+    retries and on-failure destination apply; the item stays 'pending'.
+
+    Args:
+        event: Payload containing the document_id to summarize
+        context: Lambda context object
+
+    Returns:
+        Dict containing the summarization result
+    """
+    document_id = event['document_id']
+
+    try:
+        summary = summarize_document(document_id)
+    except Exception:
+        logger.exception("Error summarizing document")
+        raise
+
+    if summary is None:
+        logger.warning("Document not found for summary: %s", document_id)
+        return {
+            'statusCode': 404,
+            'body': json.dumps({
+                'error': f"Document not found: {document_id}"
+            })
+        }
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({
+            'document_id': document_id,
+            'summary_length': len(summary)
+        })
+    }
@@ -3,8 +3,12 @@ locals {
   s3_bucket_name      = var.s3_bucket_name != null ? var.s3_bucket_name : "${var.project_name}-documents-${var.environment}-${random_string.suffix.result}"
   dynamodb_table_name = var.dynamodb_table_name != null ? var.dynamodb_table_name : "${var.project_name}-documents-${var.environment}"
   lambda_function_name = var.lambda_function_name != null ? var.lambda_function_name : "${var.project_name}-processor-${var.environment}"
+  summarizer_function_name = "${var.project_name}-summarizer-${var.environment}"
 }
 
+# Current AWS account, used as the expected bucket owner for Bedrock S3 reads
+data "aws_caller_identity" "current" {}
+
 # Random string for unique resource names
 resource "random_string" "suffix" {
   length  = 8
@@ -68,12 +72,31 @@ resource "aws_dynamodb_table" "document_table" {
     type = "N"
   }
 
+  attribute {
+    name = "etag"
+    type = "S"
+  }
+
+  attribute {
+    name = "object_key"
+    type = "S"
+  }
+
   global_secondary_index {
     name     = "UploadTimestampIndex"
     hash_key = "upload_timestamp"
     projection_type = "ALL"
   }
 
+  # Idempotency lookup for re-delivered or re-uploaded objects
+  global_secondary_index {
+    name     = "EtagIndex"
+    hash_key = "etag"
+    range_key = "object_key"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["bucket", "text_length", "summary_length"]
+  }
+
   tags = merge(var.common_tags, {
     Name = "${var.project_name}-document-table"
   })
@@ -124,10 +147,26 @@ resource "aws_iam_role_policy" "lambda_policy" {
         ]
         Resource = "${aws_s3_bucket.document_bucket.arn}/*"
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject",
+          "s3:DeleteObject"
+        ]
+        Resource = "${aws_s3_bucket.document_bucket.arn}/derived/*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket"
+        ]
+        Resource = aws_s3_bucket.document_bucket.arn
+      },
       {
         Effect = "Allow"
         Action = [
           "dynamodb:PutItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:GetItem",
           "dynamodb:UpdateItem",
           "dynamodb:Query",
@@ -173,15 +212,56 @@ resource "aws_iam_role_policy" "lambda_bedrock_policy" {
   })
 }
 
+# IAM policy for Textract text detection
+resource "aws_iam_role_policy" "lambda_textract_policy" {
+  name = "${var.project_name}-lambda-textract-policy-${var.environment}"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "textract:DetectDocumentText",
+          "textract:StartDocumentTextDetection",
+          "textract:GetDocumentTextDetection"
+        ]
+        Resource = "*"
+      }
+    ]
+  })
+}
+
+# IAM policy allowing the processor to hand off summaries to the summarizer
+resource "aws_iam_role_policy" "lambda_invoke_policy" {
+  name = "${var.project_name}-lambda-invoke-policy-${var.environment}"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:InvokeFunction"
+        ]
+        Resource = aws_lambda_function.document_summarizer.arn
+      }
+    ]
+  })
+}
+
 # Check if Bedrock model is available
 data "aws_bedrock_foundation_model" "claude_model" {
   model_id = var.bedrock_model_id
 }
 
-# Create Lambda deployment package
+# Create Lambda deployment package from the directory assembled by
+# scripts/build_lambda.sh (function source plus installed dependencies)
 data "archive_file" "lambda_zip" {
   type        = "zip"
-  source_dir  = "${path.module}/lambda"
+  source_dir  = "${path.module}/build/lambda"
   output_path = "${path.module}/lambda.zip"
 }
 
@@ -201,6 +281,8 @@ resource "aws_lambda_function" "document_processor" {
       DYNAMODB_TABLE_NAME = aws_dynamodb_table.document_table.name
       BEDROCK_MODEL_ID    = var.bedrock_model_id
       S3_BUCKET_NAME      = aws_s3_bucket.document_bucket.bucket
+      ACCOUNT_ID          = data.aws_caller_identity.current.account_id
+      SUMMARIZE_FN        = aws_lambda_function.document_summarizer.function_name
     }
   }
 
@@ -211,10 +293,43 @@ resource "aws_lambda_function" "document_processor" {
   depends_on = [
     aws_iam_role_policy.lambda_policy,
     aws_iam_role_policy.lambda_bedrock_policy,
+    aws_iam_role_policy.lambda_textract_policy,
+    aws_iam_role_policy.lambda_invoke_policy,
     aws_cloudwatch_log_group.lambda_log_group
   ]
 }
 
+# Lambda function that generates summaries asynchronously
+resource "aws_lambda_function" "document_summarizer" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = local.summarizer_function_name
+  role            = aws_iam_role.lambda_role.arn
+  handler         = "summarize_lambda.lambda_handler"
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  runtime         = "python3.11"
+  timeout         = var.lambda_timeout
+  memory_size     = var.lambda_memory_size
+
+  environment {
+    variables = {
+      DYNAMODB_TABLE_NAME = aws_dynamodb_table.document_table.name
+      BEDROCK_MODEL_ID    = var.bedrock_model_id
+      S3_BUCKET_NAME      = aws_s3_bucket.document_bucket.bucket
+      ACCOUNT_ID          = data.aws_caller_identity.current.account_id
+    }
+  }
+
+  tags = merge(var.common_tags, {
+    Name = "${var.project_name}-document-summarizer"
+  })
+
+  depends_on = [
+    aws_iam_role_policy.lambda_policy,
+    aws_iam_role_policy.lambda_bedrock_policy,
+    aws_cloudwatch_log_group.summarizer_log_group
+  ]
+}
+
 # CloudWatch log group for Lambda
 resource "aws_cloudwatch_log_group" "lambda_log_group" {
   name              = "/aws/lambda/${local.lambda_function_name}"
@@ -223,6 +338,56 @@ resource "aws_cloudwatch_log_group" "lambda_log_group" {
   tags = var.common_tags
 }
 
+# Queue receiving summarizer invocations that failed after all async retries
+resource "aws_sqs_queue" "summarizer_dlq" {
+  name                      = "${var.project_name}-summarizer-dlq-${var.environment}"
+  message_retention_seconds = 1209600
+
+  tags = var.common_tags
+}
+
+# Async retry policy and failure destination for the summarizer
+resource "aws_lambda_function_event_invoke_config" "summarizer_invoke_config" {
+  function_name                = aws_lambda_function.document_summarizer.function_name
+  maximum_retry_attempts       = 2
+  maximum_event_age_in_seconds = 3600
+
+  destination_config {
+    on_failure {
+      destination = aws_sqs_queue.summarizer_dlq.arn
+    }
+  }
+
+  depends_on = [aws_iam_role_policy.lambda_summarizer_dlq_policy]
+}
+
+# IAM policy allowing failed summarizer events to be sent to the queue
+resource "aws_iam_role_policy" "lambda_summarizer_dlq_policy" {
+  name = "${var.project_name}-lambda-summarizer-dlq-policy-${var.environment}"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:SendMessage"
+        ]
+        Resource = aws_sqs_queue.summarizer_dlq.arn
+      }
+    ]
+  })
+}
+
+# CloudWatch log group for the summarizer Lambda
+resource "aws_cloudwatch_log_group" "summarizer_log_group" {
+  name              = "/aws/lambda/${local.summarizer_function_name}"
+  retention_in_days = 14
+
+  tags = var.common_tags
+}
+
 # Lambda permission for S3 to invoke the function
 resource "aws_lambda_permission" "allow_s3_invoke" {
   statement_id  = "AllowExecutionFromS3Bucket"
@@ -232,6 +397,29 @@ resource "aws_lambda_permission" "allow_s3_invoke" {
   source_arn    = aws_s3_bucket.document_bucket.arn
 }
 
+# Scheduled EventBridge rule to keep the Lambda warm
+resource "aws_cloudwatch_event_rule" "lambda_warmer" {
+  name                = "${var.project_name}-warmer-${var.environment}"
+  description         = "Periodically invoke the document processor to avoid cold starts"
+  schedule_expression = var.lambda_warmer_schedule
+
+  tags = var.common_tags
+}
+
+resource "aws_cloudwatch_event_target" "lambda_warmer_target" {
+  rule = aws_cloudwatch_event_rule.lambda_warmer.name
+  arn  = aws_lambda_function.document_processor.arn
+}
+
+# Lambda permission for EventBridge to invoke the function
+resource "aws_lambda_permission" "allow_eventbridge_invoke" {
+  statement_id  = "AllowExecutionFromEventBridgeWarmer"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.document_processor.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.lambda_warmer.arn
+}
+
 # S3 bucket notification to trigger Lambda
 resource "aws_s3_bucket_notification" "bucket_notification" {
   bucket = aws_s3_bucket.document_bucket.id
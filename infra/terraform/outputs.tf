@@ -28,6 +28,16 @@ output "lambda_function_arn" {
   value       = aws_lambda_function.document_processor.arn
 }
 
+output "summarizer_function_name" {
+  description = "Name of the summarizer Lambda function"
+  value       = aws_lambda_function.document_summarizer.function_name
+}
+
+output "summarizer_dlq_url" {
+  description = "URL of the queue receiving failed summarizer invocations"
+  value       = aws_sqs_queue.summarizer_dlq.url
+}
+
 output "lambda_role_arn" {
   description = "ARN of the Lambda execution role"
   value       = aws_iam_role.lambda_role.arn
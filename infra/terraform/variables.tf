@@ -56,4 +56,10 @@ variable "lambda_memory_size" {
   description = "Lambda function memory size in MB"
   type        = number
   default     = 1024
-} 
\ No newline at end of file
+}
+
+variable "lambda_warmer_schedule" {
+  description = "EventBridge schedule expression for the Lambda warmer"
+  type        = string
+  default     = "rate(5 minutes)"
+}
\ No newline at end of file
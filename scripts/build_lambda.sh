@@ -0,0 +1,58 @@
+#!/bin/bash
+
+# IDC OCR Lambda Build Script
+# This script assembles the Lambda deployment package directory, installing
+# the Python dependencies as Linux wheels for the Lambda runtime
+
+set -e
+
+# Resolve paths relative to the repository root
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+SOURCE_DIR="$ROOT_DIR/infra/terraform/lambda"
+BUILD_DIR="$ROOT_DIR/infra/terraform/build/lambda"
+
+# Must match the runtime of the Lambda functions in main.tf
+PYTHON_VERSION="3.11"
+PLATFORM="manylinux2014_x86_64"
+
+# Colors for output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m' # No Color
+
+# Function to print colored output
+print_status() {
+    echo -e "${GREEN}[INFO]${NC} $1"
+}
+
+print_error() {
+    echo -e "${RED}[ERROR]${NC} $1"
+}
+
+# Check if Python is installed
+if ! command -v python3 &> /dev/null; then
+    print_error "Python 3 is not installed. Please install it first."
+    exit 1
+fi
+
+print_status "Building Lambda package in $BUILD_DIR..."
+rm -rf "$BUILD_DIR"
+mkdir -p "$BUILD_DIR"
+
+# Install dependencies as prebuilt wheels for the Lambda platform so native
+# extensions (orjson, zstandard) load regardless of the build host
+print_status "Installing Lambda dependencies..."
+python3 -m pip install \
+    --requirement "$SOURCE_DIR/requirements.txt" \
+    --target "$BUILD_DIR" \
+    --platform "$PLATFORM" \
+    --implementation cp \
+    --python-version "$PYTHON_VERSION" \
+    --only-binary=:all: \
+    --no-compile \
+    --quiet
+
+# Copy the function source
+cp "$SOURCE_DIR"/*.py "$BUILD_DIR"/
+
+print_status "Lambda package built successfully."
@@ -103,6 +103,10 @@ else
     fi
 fi
 
+# Build the Lambda package with its dependencies
+print_status "Building Lambda deployment package..."
+"$(dirname "$0")/build_lambda.sh"
+
 # Create .terragrunt-cache directory if it doesn't exist
 mkdir -p .terragrunt-cache
 
@@ -34,6 +34,9 @@ if ! command -v terragrunt &> /dev/null; then
     exit 1
 fi
 
+# Build the Lambda package, which Terraform reads to plan the destruction
+"$(dirname "$0")/build_lambda.sh"
+
 # Navigate to infrastructure directory
 cd infra
 